@@ -3,63 +3,353 @@ Student Record Manager
 A Python code to manage student data with full CRUD operations.
 """
 
+import atexit
+import bisect
+import glob
 import json
+import mmap
 import os
+import shutil
+import sys
+import weakref
+from dataclasses import dataclass
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    # orjson is an optional speed-up, the standard library json module is used without it
+    orjson = None
+
+
+def _json_loads(data):
+    """Parse JSON from bytes or a memoryview, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def _json_dumps(obj, pretty=False):
+    """Serialize obj to JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    if pretty:
+        return json.dumps(obj, indent=2, default=_encode_default).encode()
+    return json.dumps(obj, separators=(',', ':'), default=_encode_default).encode()
+
+
+def _encode_default(obj):
+    """Let the standard json module serialize Student records, orjson handles dataclasses itself"""
+    if isinstance(obj, Student):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _read_json(path):
+    """Parse a JSON file through a read-only memory map instead of reading it into memory first"""
+    with open(path, 'rb') as file:
+        # An empty file cannot be mapped, let the parser reject it like any other invalid JSON
+        if os.fstat(file.fileno()).st_size == 0:
+            return _json_loads(b'')
+        
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as view:
+                return _json_loads(view)
+
+
+# Managers still alive at exit, held weakly so registering one does not keep it in memory
+_open_managers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_managers():
+    """Make sure buffered changes reach the disk even if close() is never called"""
+    for manager in list(_open_managers):
+        manager.close()
+
+
+def _intern_grade(grade):
+    """Share one string object per grade, converting non-string grades from hand-edited files"""
+    return sys.intern(grade if isinstance(grade, str) else str(grade))
+
+
+@dataclass(slots=True)
+class Student:
+    """A single student record, stored as a plain JSON object on disk"""
+    id: str
+    name: str
+    age: int
+    grade: str
+    email: str | None = None
+    phone: str | None = None
+    created_at: str = ''
+    updated_at: str = ''
+    
+    # Fields a stored record cannot do without, the rest fall back to their defaults
+    REQUIRED_FIELDS = ('id', 'name', 'age', 'grade')
+    
+    def __post_init__(self):
+        """Intern the grade once, when the record is created"""
+        self.grade = _intern_grade(self.grade)
+    
+    @classmethod
+    def from_dict(cls, data):
+        """Build a record from a decoded JSON object, ignoring keys that are not Student fields"""
+        if not isinstance(data, dict):
+            raise ValueError("record is not a JSON object")
+        
+        missing = [field for field in cls.REQUIRED_FIELDS if field not in data]
+        if missing:
+            raise ValueError(f"record is missing {', '.join(missing)}")
+        # Ages are indexed and averaged, so anything but a whole number cannot be used
+        if not isinstance(data['age'], int) or isinstance(data['age'], bool):
+            raise ValueError(f"age must be a whole number, got {data['age']!r}")
+        
+        return cls(**{field: data[field] for field in cls.__slots__ if field in data})
+    
+    def to_dict(self):
+        """Get the record as a dict in the on-disk field order"""
+        return {field: getattr(self, field) for field in self.__slots__}
+
 
 class StudentRecordManager:
     """Main class to manage student records"""
     
+    # Number of journaled changes after which the journal is folded back into the main file
+    COMPACT_THRESHOLD = 100
+    
+    # Text fields whose lowercased values are cached for case-insensitive search
+    TEXT_FIELDS = ('name', 'email', 'phone')
+    
     def __init__(self, filename="student_records.json"):
         self.filename = filename
+        self.journal_filename = filename + ".log"
+        self._journal = None
+        # Set once this instance journals a change, a manager that only read the records never writes them back
+        self._dirty = False
         self.students = self.load_records()
+        self._reindex()
+        _open_managers.add(self)
     
     def load_records(self):
-        """Load student records from JSON file"""
+        """Load student records from JSON file and replay the change journal"""
         try:
             if os.path.exists(self.filename):
-                with open(self.filename, 'r') as file:
-                    return json.load(file)
-            return {}
+                students = _read_json(self.filename)
+            else:
+                students = {}
         except (json.JSONDecodeError, FileNotFoundError):
-            return {}
+            students = {}
+        if not isinstance(students, dict):
+            # Not a records file, treat it like one that cannot be parsed
+            students = {}
+        
+        self._journal_ops = self._replay_journal(students)
+        return self._to_students(students)
     
-    def save_records(self):
-        with open(self.filename, 'w') as file:
-            json.dump(self.students, file, indent=4)
+    @staticmethod
+    def _to_students(records):
+        """Turn decoded JSON objects into Student records, reporting and skipping invalid ones"""
+        # Keep whatever can be read rather than refusing a whole file over one bad record
+        students = {}
+        for student_id, data in records.items():
+            try:
+                students[student_id] = Student.from_dict(data)
+            except ValueError as e:
+                print(f"Skipping invalid student record {student_id}: {e}")
+        return students
+    
+    def _replay_journal(self, students):
+        """Apply journaled changes on top of the loaded records, return how many were applied"""
+        if not os.path.exists(self.journal_filename):
+            return 0
+        
+        applied = 0
+        intact_size = 0
+        with open(self.journal_filename, 'rb') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    # A torn last line from an interrupted write, everything before it is intact
+                    break
+                
+                intact_size += len(line)
+                try:
+                    entry = _json_loads(line)
+                    # Entries carry the whole record, so replaying one twice is harmless
+                    if entry['op'] == 'delete':
+                        students.pop(entry['id'], None)
+                    else:
+                        students[entry['id']] = entry['data']
+                except (json.JSONDecodeError, KeyError, TypeError) as e:
+                    # Like a bad record in the main file, skip it rather than refusing to start
+                    print(f"Skipping invalid journal entry: {e}")
+                    continue
+                applied += 1
+        
+        # Cut the torn bytes off, otherwise the next appended entry would be glued onto them and lost
+        if intact_size < os.path.getsize(self.journal_filename):
+            os.truncate(self.journal_filename, intact_size)
+        
+        return applied
+    
+    def save_records(self, pretty=False):
+        """Save student records to JSON file, compact unless pretty output is requested"""
+        # Write a temporary file and rename it over the old one, so a crash never leaves a half-written file
+        temp_filename = self.filename + ".tmp"
+        with open(temp_filename, 'wb') as file:
+            file.write(_json_dumps(self.students, pretty))
+        os.replace(temp_filename, self.filename)
+    
+    def _log_change(self, op, student_id):
+        """Append a single change to the journal instead of rewriting the whole file"""
+        if self._journal is None:
+            self._journal = open(self.journal_filename, 'ab')
+        
+        entry = {'op': op, 'id': student_id, 'data': self.students.get(student_id)}
+        # Left in the write buffer so back-to-back changes share one write, see flush()
+        self._journal.write(_json_dumps(entry) + b"\n")
+        self._dirty = True
+        
+        self._journal_ops += 1
+        if self._journal_ops >= self.COMPACT_THRESHOLD:
+            self.compact()
+    
+    def flush(self):
+        """Write buffered journal changes to disk"""
+        if self._journal is not None:
+            self._journal.flush()
+    
+    def compact(self):
+        """Write all records to the main file and discard the journal"""
+        self.save_records()
+        self._discard_journal()
+    
+    def _discard_journal(self):
+        """Close and delete the journal once the main file holds all changes"""
+        if self._journal is not None:
+            self._journal.close()
+            self._journal = None
+        if os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
+        self._journal_ops = 0
+        self._dirty = False
+    
+    def close(self):
+        """Fold changes made through this manager into the main file"""
+        if self._dirty:
+            self.compact()
+        elif self._journal is not None:
+            self._journal.close()
+            self._journal = None
+    
+    def _reindex(self):
+        """Rebuild cached lookup state after self.students is replaced"""
+        self._by_grade = {}
+        self._by_age = {}
+        # One column (ID -> lowercased value) per text field, so a search reads only the fields it filters on
+        self._lowered = {field: {} for field in self.TEXT_FIELDS}
+        # (lowercased name, ID) pairs kept in sorted order for listing students by name
+        self._by_name = []
+        
+        highest_id = 0
+        for student_id, student in self.students.items():
+            self._index_student(student_id, student, bulk=True)
+            
+            # IDs that do not follow the STU<number> pattern cannot collide with generated ones
+            number = student_id[3:]
+            if student_id.startswith("STU") and number.isdecimal():
+                highest_id = max(highest_id, int(number))
+        self._by_name.sort()
+        
+        # IDs are monotonic: the counter only moves forward, so deleted IDs are never reused
+        self._next_id = highest_id + 1
+    
+    def _index_student(self, student_id, student, bulk=False):
+        """Add a record to the secondary indexes"""
+        self._by_grade.setdefault(student.grade, set()).add(student_id)
+        self._by_age.setdefault(student.age, set()).add(student_id)
+        for field, column in self._lowered.items():
+            value = getattr(student, field)
+            column[student_id] = '' if value is None else str(value).lower()
+        
+        name_key = (self._lowered['name'][student_id], student_id)
+        if bulk:
+            # The caller sorts once after indexing every record
+            self._by_name.append(name_key)
+        else:
+            bisect.insort(self._by_name, name_key)
+    
+    def _unindex_student(self, student_id, student):
+        """Remove a record from the secondary indexes"""
+        for index, key in ((self._by_grade, student.grade), (self._by_age, student.age)):
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(student_id)
+                if not ids:
+                    del index[key]
+        
+        name_key = (self._lowered['name'][student_id], student_id)
+        position = bisect.bisect_left(self._by_name, name_key)
+        if position < len(self._by_name) and self._by_name[position] == name_key:
+            del self._by_name[position]
+        
+        for column in self._lowered.values():
+            column.pop(student_id, None)
+    
+    def restore_from_file(self, backup_file):
+        """Replace all student records with the contents of a backup file"""
+        records = _read_json(backup_file)
+        if not isinstance(records, dict):
+            raise ValueError(f"{backup_file} does not contain student records")
+        students = self._to_students(records)
+        
+        # Index the new records before the records file is touched, and put everything back if that fails
+        previous, next_id = self.students, self._next_id
+        self.students = students
+        try:
+            self._reindex()
+            
+            if len(students) == len(records):
+                # A backup is already in the records file format, so copy its bytes rather than re-encoding
+                temp_filename = self.filename + ".tmp"
+                shutil.copyfile(backup_file, temp_filename)
+                os.replace(temp_filename, self.filename)
+            else:
+                # Some records were skipped, write only the ones that were kept
+                self.save_records()
+        except Exception:
+            self.students = previous
+            self._reindex()
+            self._next_id = next_id
+            raise
+        
+        self._discard_journal()
     
     def generate_id(self):
         """Generate a unique student ID"""
-        if not self.students:
-            return "STU001"
-        
-        # Find the highest ID and increment
-        ids = [int(sid[3:]) for sid in self.students.keys() if sid.startswith("STU")]
-        if ids:
-            new_id = max(ids) + 1
-        else:
-            new_id = 1
-        
+        new_id = self._next_id
+        self._next_id += 1
         return f"STU{new_id:03d}"
     
     def add_student(self, name, age, grade, email=None, phone=None):
         """For Adding a new student record"""
         student_id = self.generate_id()
-        
-        student = {
-            'id': student_id,
-            'name': name,
-            'age': age,
-            'grade': grade,
-            'email': email,
-            'phone': phone,
-            'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            'updated_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        }
+        timestamp = datetime.now().isoformat(sep=" ", timespec="seconds")
+
+        student = Student(
+            id=student_id,
+            name=name,
+            age=age,
+            grade=grade,
+            email=email,
+            phone=phone,
+            created_at=timestamp,
+            updated_at=timestamp
+        )
         
         self.students[student_id] = student
-        self.save_records()
+        self._index_student(student_id, student)
+        self._log_change('add', student_id)
         return student_id
     
     def update_student(self, student_id, **kwargs):
@@ -68,20 +358,23 @@ class StudentRecordManager:
             return False
         
         valid_fields = ['name', 'age', 'grade', 'email', 'phone']
+        student = self.students[student_id]
         
+        self._unindex_student(student_id, student)
         for field, value in kwargs.items():
             if field in valid_fields and value is not None:
-                self.students[student_id][field] = value
+                setattr(student, field, _intern_grade(value) if field == 'grade' else value)
+        self._index_student(student_id, student)
         
-        self.students[student_id]['updated_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.save_records()
+        student.updated_at = datetime.now().isoformat(sep=" ", timespec="seconds")
+        self._log_change('update', student_id)
         return True
     
     def delete_student(self, student_id):
         """Delete a student record"""
         if student_id in self.students:
-            del self.students[student_id]
-            self.save_records()
+            self._unindex_student(student_id, self.students.pop(student_id))
+            self._log_change('delete', student_id)
             return True
         return False
     
@@ -90,18 +383,49 @@ class StudentRecordManager:
     
     def search_students(self, **criteria):
         """Search students by multiple criteria"""
+        # Blank criteria and unknown fields are skipped, drop them once rather than checking them for every record
+        criteria = {key: value for key, value in criteria.items() if value and key in Student.__slots__}
+        
+        # grade and age are matched exactly through their indexes before touching any record
+        indexes = {'grade': self._by_grade, 'age': self._by_age}
+        candidates = None
+        for key, index in indexes.items():
+            if key in criteria:
+                ids = index.get(criteria[key], set())
+                candidates = ids if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+        
+        # Lowercase the query once rather than once per record
+        remaining = [
+            (key, value.lower() if isinstance(value, str) else value, self._lowered.get(key))
+            for key, value in criteria.items()
+            if key not in indexes
+        ]
+        
+        if candidates is None:
+            candidates = self.students
+        else:
+            # Sets have no useful order, list matches in ID order like a full scan would
+            candidates = sorted(candidates, key=lambda sid: (len(sid), sid))
+            if not remaining:
+                # The indexes answered the whole query
+                return [self.students[student_id] for student_id in candidates]
+        
         results = []
         
-        for student in self.students.values():
+        for student_id in candidates:
+            student = self.students[student_id]
             match = True
-            for key, value in criteria.items():
-                if key in student and value:
-                    if isinstance(value, str) and value.lower() not in str(student[key]).lower():
-                        match = False
-                        break
-                    elif student[key] != value:
+            for key, value, column in remaining:
+                if isinstance(value, str):
+                    stored = column[student_id] if column is not None else str(getattr(student, key)).lower()
+                    if value not in stored:
                         match = False
                         break
+                elif getattr(student, key) != value:
+                    match = False
+                    break
             
             if match:
                 results.append(student)
@@ -112,6 +436,10 @@ class StudentRecordManager:
         """Get all student records"""
         return list(self.students.values())
     
+    def get_students_sorted_by_name(self):
+        """Get all student records ordered by name, ignoring case"""
+        return [self.students[student_id] for _, student_id in self._by_name]
+    
     def get_statistics(self):
         """Get statistics about student records"""
         if not self.students:
@@ -121,14 +449,11 @@ class StudentRecordManager:
                 'grade_distribution': {}
             }
         
+        # The age and grade indexes already group students, so no record has to be visited
         total_students = len(self.students)
-        ages = [student['age'] for student in self.students.values()]
-        average_age = sum(ages) / total_students
+        average_age = sum(age * len(ids) for age, ids in self._by_age.items()) / total_students
         
-        grades = {}
-        for student in self.students.values():
-            grade = student['grade']
-            grades[grade] = grades.get(grade, 0) + 1
+        grades = {grade: len(ids) for grade, ids in self._by_grade.items()}
         
         return {
             'total_students': total_students,
@@ -139,20 +464,22 @@ class StudentRecordManager:
     def display_student(self, student):
         """For displaying a single student record in a formatted way"""
         print("\n" + "="*50)
-        print(f"ID: {student['id']}")
-        print(f"Name: {student['name']}")
-        print(f"Age: {student['age']}")
-        print(f"Grade: {student['grade']}")
-        if student.get('email'):
-            print(f"Email: {student['email']}")
-        if student.get('phone'):
-            print(f"Phone: {student['phone']}")
-        print(f"Created: {student['created_at']}")
-        print(f"Updated: {student['updated_at']}")
+        print(f"ID: {student.id}")
+        print(f"Name: {student.name}")
+        print(f"Age: {student.age}")
+        print(f"Grade: {student.grade}")
+        if student.email:
+            print(f"Email: {student.email}")
+        if student.phone:
+            print(f"Phone: {student.phone}")
+        print(f"Created: {student.created_at}")
+        print(f"Updated: {student.updated_at}")
         print("="*50)
 
 
 class StudentRecordCLI:
+    VALID_GRADES = frozenset('ABCDF')
+    
     def __init__(self):
         self.manager = StudentRecordManager()
     
@@ -194,7 +521,7 @@ class StudentRecordCLI:
     
     def validate_grade(self, grade_str):
         grade = grade_str.upper()
-        if grade not in ['A', 'B', 'C', 'D', 'F']:
+        if grade not in self.VALID_GRADES:
             raise ValueError("Grade must be A, B, C, D, or F")
         return grade
     
@@ -218,7 +545,7 @@ class StudentRecordCLI:
         print(f"\n✓ Student added successfully! Student ID: {student_id}")
     
     def view_all_students_ui(self):
-        students = self.manager.get_all_students()
+        students = self.manager.get_students_sorted_by_name()
         
         if not students:
             print("\nNo student records found.")
@@ -226,9 +553,6 @@ class StudentRecordCLI:
         
         print(f"\n--- ALL STUDENTS ({len(students)} records) ---")
         
-        # Sort students by name
-        students.sort(key=lambda x: x['name'])
-        
         for student in students:
             self.manager.display_student(student)
         
@@ -242,7 +566,7 @@ class StudentRecordCLI:
         age_str = input("Age: ").strip()
         age = int(age_str) if age_str.isdigit() else None
         grade = input("Grade (A, B, C, D, F): ").strip().upper() or None
-        grade = grade if grade in ['A', 'B', 'C', 'D', 'F', ''] else None
+        grade = grade if grade in self.VALID_GRADES else None
         
         results = self.manager.search_students(name=name, age=age, grade=grade)
         
@@ -270,19 +594,19 @@ class StudentRecordCLI:
         
         print("\nEnter new values (leave blank to keep current):")
         
-        name = input(f"Name [{student['name']}]: ").strip()
+        name = input(f"Name [{student.name}]: ").strip()
         name = name if name else None
         
-        age_str = input(f"Age [{student['age']}]: ").strip()
+        age_str = input(f"Age [{student.age}]: ").strip()
         age = int(age_str) if age_str.isdigit() else None
         
-        grade = input(f"Grade [{student['grade']}]: ").strip().upper()
-        grade = grade if grade in ['A', 'B', 'C', 'D', 'F', ''] else None
+        grade = input(f"Grade [{student.grade}]: ").strip().upper()
+        grade = grade if grade in self.VALID_GRADES else None
         
-        email = input(f"Email [{student.get('email', 'None')}]: ").strip()
+        email = input(f"Email [{student.email}]: ").strip()
         email = email if email else None
         
-        phone = input(f"Phone [{student.get('phone', 'None')}]: ").strip()
+        phone = input(f"Phone [{student.phone}]: ").strip()
         phone = phone if phone else None
         
         if self.manager.update_student(
@@ -311,7 +635,7 @@ class StudentRecordCLI:
         print("\nStudent to delete:")
         self.manager.display_student(student)
         
-        confirm = input(f"\nAre you sure you want to delete {student['name']}? (yes/no): ").strip().lower()
+        confirm = input(f"\nAre you sure you want to delete {student.name}? (yes/no): ").strip().lower()
         
         if confirm == 'yes':
             if self.manager.delete_student(student_id):
@@ -340,34 +664,31 @@ class StudentRecordCLI:
         backup_file = f"student_records_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
         
         try:
-            with open(backup_file, 'w') as file:
-                json.dump(self.manager.students, file, indent=4)
+            # Rewrite the records file from what the manager holds, so the copy never carries
+            # records that were skipped on load, then copy its bytes as they are
+            self.manager.compact()
+            shutil.copyfile(self.manager.filename, backup_file)
             print(f"\n✓ Backup created successfully: {backup_file}")
         except Exception as e:
             print(f"\n✗ Failed to create backup: {e}")
     
     def restore_records_ui(self):
         """Restore student records from backup"""
-        backup_files = [f for f in os.listdir('.') if f.startswith('student_records_backup')]
+        backup_files = sorted(glob.iglob('student_records_backup*.json'), reverse=True)
         
         if not backup_files:
             print("\n✗ No backup files found.")
             return
         
         print("\nAvailable backup files:")
-        for i, file in enumerate(sorted(backup_files, reverse=True), 1):
+        for i, file in enumerate(backup_files, 1):
             print(f"{i}. {file}")
         
         try:
             choice = int(input("\nSelect backup to restore (number): "))
             if 1 <= choice <= len(backup_files):
                 backup_file = backup_files[choice - 1]
-                
-                with open(backup_file, 'r') as file:
-                    backup_data = json.load(file)
-                
-                self.manager.students = backup_data
-                self.manager.save_records()
+                self.manager.restore_from_file(backup_file)
                 print(f"\n✓ Records restored from {backup_file}")
             else:
                 print("\n✗ Invalid selection.")
@@ -406,6 +727,7 @@ class StudentRecordCLI:
                 else:
                     print("\n✗ Invalid choice. Please enter a number between 1-9.")
                 
+                self.manager.flush()
                 input("\nPress Enter to continue...")
                 self.clear_screen()
                 
@@ -415,6 +737,8 @@ class StudentRecordCLI:
             except Exception as e:
                 print(f"\n✗ An error occurred: {e}")
                 input("Press Enter to continue...")
+        
+        self.manager.close()
 
 
 if __name__ == "__main__":